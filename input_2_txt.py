@@ -19,20 +19,27 @@ Fill in the variables below.  Leave OUTDIR empty ("") to default
 to the script’s own directory.
 """
 
+import hashlib
 import pathlib
-import re
+import shutil
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import subprocess
 from faster_whisper import WhisperModel
 from faster_whisper import BatchedInferencePipeline
 import os
+import threading
 import yt_dlp
 import numpy as np
 import multiprocessing as mp
+from multiprocessing.connection import Client, Listener
 
-threads = str(mp.cpu_count())
+# Cap worker threads: OpenMP × BLAS oversubscription degrades CTranslate2
+# throughput once every batched window spawns its own full thread team.
+CPU_THREADS = min(8, mp.cpu_count() or 4)
+threads = str(CPU_THREADS)
 os.environ["OMP_NUM_THREADS"] = threads
 os.environ["MKL_NUM_THREADS"] = threads
 
@@ -49,72 +56,126 @@ END_TS   = ""  # HH:MM:SS (empty → clip end)
 OUTDIR   = r"output"   # "" → script folder
 MODEL = 'medium'  # use smaller Whisper model -> faster, less accurate) + ".en" for English etc.
 # Available models: tiny, base, small, medium, large-v1, large-v2
-COMP_TYPE = 'int8_float32'  # 'int8', 'float16', 'int16', 'float32', 'int8_float32' ...
-
-TS_RE = re.compile(r"^(\d\d):([0-5]\d):([0-5]\d)$")
+COMP_TYPE = 'auto'  # 'auto' picks per device; or force 'int8', 'float16', 'int16', 'float32', 'int8_float32' ...
+BATCH_SIZE = 8         # 30-s windows decoded in parallel; scale with cores / VRAM
+BEAM_SIZE = 3          # 1 = greedy/fastest, 5 = faster-whisper default
+PATIENCE = 1.2         # 1.0 = default, higher = more accurate beam search
+VAD = True             # silero VAD pre-pass: silence never reaches the model
+VAD_MIN_SILENCE_MS = 500  # pauses shorter than this are kept (natural speech gaps)
+USE_SERVER = True      # keep the model warm in a background process across runs
+SERVER_IDLE_MIN = 10   # background server exits after this many idle minutes
+KEEP_MP3 = False       # also write audio.mp3 next to the transcript
+USE_CACHE = True       # reuse transcripts of identical clips from ~/.cache/whisper_clips
 
 # ───────────────── helpers ────────────────── #
 def ts_to_sec(ts: str) -> int:
-    m = TS_RE.match(ts)
-    if not m:
+    """Parses 'HH:MM:SS' with plain byte arithmetic – no regex engine."""
+    try:
+        b = ts.encode('ascii')
+    except UnicodeEncodeError:
+        b = b''
+    if (len(b) != 8 or b[2] != 58 or b[5] != 58  # 58 == ord(':')
+            or any(not 48 <= b[i] <= 57 for i in (0, 1, 3, 4, 6, 7))):
+        raise ValueError(f"Bad timestamp {ts!r}. Use HH:MM:SS.")
+    h = (b[0] - 48) * 10 + (b[1] - 48)
+    m_ = (b[3] - 48) * 10 + (b[4] - 48)
+    s = (b[6] - 48) * 10 + (b[7] - 48)
+    if m_ >= 60 or s >= 60:
         raise ValueError(f"Bad timestamp {ts!r}. Use HH:MM:SS.")
-    h, m_, s = map(int, m.groups())
     return h * 3600 + m_ * 60 + s
 
 def sec_to_ts(sec: int) -> str:
     h, rem = divmod(sec, 3600)
     m, s = divmod(rem, 60)
-    return f"{h:02d}:{m:02d}:{s:02d}"
+    if h > 99:  # keep the old f-string behaviour for absurdly long media
+        return f"{h:02d}:{m:02d}:{s:02d}"
+    return bytes((
+        48 + h // 10, 48 + h % 10, 58,
+        48 + m // 10, 48 + m % 10, 58,
+        48 + s // 10, 48 + s % 10,
+    )).decode('ascii')
 
 def ensure_outdir(path_hint: str) -> pathlib.Path:
     d = pathlib.Path(path_hint) if path_hint else pathlib.Path(__file__).parent
     d.mkdir(parents=True, exist_ok=True)
     return d.resolve()
 
-def get_video_duration(url: str) -> int | None:
-    """Ask yt‑dlp (quietly) for duration in seconds."""
-    opts = {'quiet': True, 'get_duration': True, 'nocheckcertificate': True}
+def probe_url(url: str) -> tuple[int | None, str | None, dict]:
+    """
+    One yt-dlp extractor round-trip for everything we need from a URL:
+    duration in seconds, the best direct audio stream URL, and the HTTP
+    headers that stream must be fetched with.
+    """
+    opts = {'quiet': True, 'format': 'bestaudio/best', 'nocheckcertificate': True}
     try:
         with yt_dlp.YoutubeDL(opts) as ydl:
-            return int(ydl.extract_info(url, download=False).get('duration') or 0) or None
+            info = ydl.extract_info(url, download=False)
+        dur = int(info.get('duration') or 0) or None
+        return dur, info.get('url'), info.get('http_headers') or {}
+    except Exception:
+        return None, None, {}
+
+def probe_audio_codec(path: pathlib.Path) -> str | None:
+    """Ask ffprobe for the codec of the first audio stream."""
+    try:
+        out = subprocess.check_output(
+            ['ffprobe', '-v', 'error', '-select_streams', 'a:0',
+             '-show_entries', 'stream=codec_name',
+             '-of', 'default=noprint_wrappers=1:nokey=1', str(path)], text=True)
+        return out.strip() or None
     except Exception:
         return None
 
-def extract_audio_local(src: pathlib.Path, start: str, end: str, dest_mp3: pathlib.Path):
-    """ffmpeg-trim any local mp3/mp4 to an MP3 clip."""
+def extract_audio_local(src: pathlib.Path, start: str, end: str, dest_mp3: pathlib.Path) -> np.ndarray:
+    """
+    ffmpeg-trims a local mp3/mp4 straight to 16 kHz mono float32 PCM in
+    memory – the exact form Whisper consumes, so nothing is re-decoded.
+    """
     print('[1/2] Extracting local clip… Please wait…')
     cmd = [
-        'ffmpeg', '-v', 'error',  # keep ffmpeg quiet
-        '-ss', start, *(['-to', end] if end else []),
+        'ffmpeg', '-v', 'error', '-y',  # keep ffmpeg quiet, overwrite dest_mp3 if present
+        '-ss', start, *(['-to', end] if end else []),  # -ss before -i → fast keyframe seek
         '-i', str(src),
-        '-vn', '-acodec', 'libmp3lame',  # audio-only → mp3
-        str(dest_mp3)
+        '-map', '0:a:0',
+        '-f', 'f32le', '-ac', '1', '-ar', '16000', 'pipe:1',
     ]
-    run = subprocess.run(cmd)
-    if run.returncode != 0 or not dest_mp3.exists():
-        raise RuntimeError('ffmpeg failed – see messages above.')
-    print(f'✔ Clip saved to {dest_mp3}')
+    if KEEP_MP3:
+        # Optional on-disk artifact, written by the same ffmpeg run.
+        # Sources already carrying MP3 audio are remuxed with stream copy.
+        if probe_audio_codec(src) == 'mp3':
+            codec = ['-c:a', 'copy']
+        else:
+            codec = ['-acodec', 'libmp3lame']
+        cmd += ['-vn', '-map', '0:a:0', *codec, str(dest_mp3)]
 
-def load_audio_from_mp3(mp3_path: pathlib.Path) -> np.ndarray:
-    """
-    Runs ffmpeg to decode mp3_path into a float32 PCM array
-    (16 kHz, mono). Returns a 1-D numpy array in [-1.0, +1.0].
-    """
-    cmd = [
-        'ffmpeg', '-v', 'error',
-        '-i', str(mp3_path),       # input
-        '-ac', '1',                # mono
-        '-ar', '16000',            # 16 kHz
-        '-f', 'f32le',             # raw float32 little-endian
-        'pipe:1'                   # → stdout
-    ]
     proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
     raw, _ = proc.communicate()
-    # Interpret as float32
     audio = np.frombuffer(raw, dtype=np.float32)
+    if proc.returncode != 0 or audio.size == 0:
+        raise RuntimeError('ffmpeg failed – see messages above.')
+    print(f'✔ Clip decoded ({audio.size / 16000:.0f} s of audio).')
+    if KEEP_MP3:
+        print(f'✔ Clip saved to {dest_mp3}')
     return audio
 
 
+def pick_compute_type(device: str) -> str:
+    """
+    Pick the fastest CTranslate2 compute type the hardware supports:
+    int8_float16 on tensor-core GPUs (compute capability ≥ 7),
+    float16 on older CUDA cards, int8 on CPU (VNNI where available).
+    """
+    if device == 'cuda':
+        try:
+            import torch
+            if torch.cuda.get_device_capability()[0] >= 7:
+                return 'int8_float16'
+        except Exception:
+            pass
+        return 'float16'
+    return 'int8'
+
+
 def get_local_duration(path: pathlib.Path) -> int | None:
     try:
         out = subprocess.check_output(
@@ -129,111 +190,348 @@ def get_local_duration(path: pathlib.Path) -> int | None:
 
 # ───────── yt‑dlp download ───────── #
 
-def download_audio(url: str, start: str, end: str, dest_mp3: pathlib.Path):
-    print('[1/2] Downloading & extracting clip…')
+def download_audio(url: str, start: str, end: str, dest_mp3: pathlib.Path,
+                   media_url: str | None = None, headers: dict | None = None) -> np.ndarray:
+    """
+    Downloads, trims and decodes in one pass: the clip's direct stream
+    URL (resolved in-process – no second interpreter start-up, usually
+    already known from the duration probe) is handed to ffmpeg, which
+    fetches, trims and emits 16 kHz mono float32 PCM straight into memory.
+    """
+    print('[1/2] Downloading & decoding clip…')
 
-    cmd = [
-        sys.executable, '-m', 'yt_dlp',
-        url,
-        '-S', 'hasaud,+filesize',
-        '-x', '--audio-format', 'mp3',
-        '--download-sections', f"*{start}-{end}",
-        '-o', 'audio.%(ext)s',
-        '-P', str(dest_mp3.parent)
+    out_args = [
+        '-f', 'f32le', '-ac', '1', '-ar', '16000', 'pipe:1',
+        *(['-vn', '-acodec', 'libmp3lame', str(dest_mp3)] if KEEP_MP3 else [])
     ]
 
-    # inherit stdout/stderr → full logging visible (incl. keyboard buffer)
-    run = subprocess.run(cmd)
-    if run.returncode != 0:
-        raise RuntimeError('yt‑dlp failed – see messages above.')
+    if media_url is None:
+        _, media_url, headers = probe_url(url)
+
+    raw = None
+    if media_url:
+        # ffmpeg pulls the stream itself; -ss before -i lets it
+        # range-request only the clip instead of the whole file.
+        header_args = (['-headers', ''.join(f'{k}: {v}\r\n' for k, v in headers.items())]
+                       if headers else [])
+        ff_cmd = [
+            'ffmpeg', '-v', 'error', '-y', *header_args,  # -y: dest_mp3 may exist from a failed try
+            '-ss', start, *(['-to', end] if end else []),
+            '-i', media_url, *out_args
+        ]
+        ff = subprocess.Popen(ff_cmd, stdout=subprocess.PIPE)
+        raw, _ = ff.communicate()
+        if ff.returncode != 0:
+            # Direct URLs can 403 or throttle (common on YouTube) – the
+            # yt-dlp download below usually still works.
+            print('▶ Direct stream fetch failed – falling back to yt-dlp download.')
+            raw = None
+
+    if raw is None:
+        # Fallback for streams ffmpeg can't fetch (or fetch fails): download
+        # via the in-process yt-dlp API to a temp file, then trim+decode it.
+        tmp_stem = dest_mp3.with_name('source_audio')
+        opts = {
+            'quiet': True, 'noprogress': True,
+            'format': 'bestaudio/best',
+            'outtmpl': f'{tmp_stem}.%(ext)s',
+            'nocheckcertificate': True,
+        }
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            ydl.download([url])
+        tmp_files = sorted(dest_mp3.parent.glob('source_audio.*'))
+        if not tmp_files:
+            raise RuntimeError('yt‑dlp finished but no audio file found.')
+        ff_cmd = [
+            'ffmpeg', '-v', 'error', '-y',
+            '-ss', start, *(['-to', end] if end else []),
+            '-i', str(tmp_files[0]), *out_args
+        ]
+        ff = subprocess.Popen(ff_cmd, stdout=subprocess.PIPE)
+        raw, _ = ff.communicate()
+        for f in tmp_files:
+            f.unlink(missing_ok=True)
+        if ff.returncode != 0:
+            raise RuntimeError('ffmpeg failed – see messages above.')
 
-    if not dest_mp3.exists():
-        raise RuntimeError('yt‑dlp finished but audio.mp3 not found.')
+    audio = np.frombuffer(raw, dtype=np.float32)
+    if audio.size == 0:
+        raise RuntimeError('No audio decoded – check URL and clip range.')
 
-    print(f'✔ Clip saved to {dest_mp3}')
+    print(f'✔ Clip decoded ({audio.size / 16000:.0f} s of audio).')
+    if KEEP_MP3:
+        print(f'✔ Clip saved to {dest_mp3}')
+    return audio
 
 
-# ───────── Whisper transcription ───────── #
+# ───────── transcript cache ───────── #
+
+CACHE_DIR = pathlib.Path.home() / '.cache' / 'whisper_clips'
+
+def cache_file_for(audio: np.ndarray, model_name: str) -> pathlib.Path:
+    """Content-addressed cache entry for this exact clip + settings."""
+    # Hash the array's buffer directly: no .tobytes() copy of the whole
+    # clip, and OpenSSL dispatches to SHA-NI/ARMv8-SHA2 where available.
+    h = hashlib.sha256(memoryview(np.ascontiguousarray(audio))).hexdigest()
+    # Every setting that changes the transcript must be part of the key,
+    # or flipping it would silently return a stale entry for this clip.
+    # Quantization changes the text too, so the *resolved* compute type
+    # goes in ('auto' varies with the device it ran on).
+    comp = COMP_TYPE if COMP_TYPE != 'auto' else pick_compute_type(detect_device())
+    tag = f'{comp}_b{BEAM_SIZE}_p{PATIENCE}'
+    tag += f'_vad{VAD_MIN_SILENCE_MS}' if VAD else '_novad'
+    return CACHE_DIR / f'{h}_{model_name}_{tag}.txt'
+
+def cache_store(txt_path: pathlib.Path, cache_file: pathlib.Path):
+    """Copies a finished transcript into the cache atomically."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix('.tmp')
+    shutil.copy(txt_path, tmp)
+    os.replace(tmp, cache_file)
 
-def write_transcript(segments: list, file_path: pathlib.Path, source: str, start: str, end: str):
-    """Writes the transcript segments to a text file."""
-    # You could also format this as an SRT file, JSON, etc.
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(f'Transcript of: "{source}"\n')
-        f.write(f"Full duration: [{start} --> {end}]\n\n")
-        for seg in segments:
-            # Simple text output
-            start_ts = sec_to_ts(int(seg['start']))
-            end_ts = sec_to_ts(int(seg['end']))
-            f.write(f"[{start_ts} --> {end_ts}] {seg['text'].strip()}\n")
-
-def transcribe(mp3_path: pathlib.Path,
-               txt_path: pathlib.Path,
-               model_name: str,
-               compute_type: str,
-               source: str,
-               start: str,
-               end: str):
-    """Transcribes the audio using faster-whisper and handles interrupts gracefully."""
-    print('\n[2/2] Transcribing audio …')
-    t0 = time.time()
 
+# ───────── Whisper transcription ───────── #
+
+def detect_device() -> str:
     try:
         import torch
-        device = 'cuda' if torch.cuda.is_available() else 'cpu'
-
+        return 'cuda' if torch.cuda.is_available() else 'cpu'
     except ImportError:
-        device = 'cpu'
+        return 'cpu'
+
+def load_pipeline(model_name: str, compute_type: str) -> BatchedInferencePipeline:
+    """Loads the model and wraps it in a batched pipeline."""
+    device = detect_device()
+    if compute_type == 'auto':
+        compute_type = pick_compute_type(device)
+    else:
+        # A forced COMP_TYPE may not exist on this hardware (e.g. float16
+        # on CPU) – fall back to the auto pick instead of crashing.
+        try:
+            import ctranslate2
+            if compute_type not in ctranslate2.get_supported_compute_types(device):
+                fallback = pick_compute_type(device)
+                print(f'▶ "{compute_type}" not supported on {device.upper()} – using "{fallback}".')
+                compute_type = fallback
+        except ImportError:
+            pass
 
     print(f'▶ Loading Whisper "{model_name}" on {device.upper()} with {compute_type} …')
     model = WhisperModel(
         model_name,
         device=device,
         compute_type=compute_type,
-        # Set to a number that works for your CPU, os.cpu_count() is a good default
-        cpu_threads=os.cpu_count() or 4
+        cpu_threads=CPU_THREADS  # matches the OMP/MKL cap set at import
     )
+    return BatchedInferencePipeline(model=model)
 
-    pipe  = BatchedInferencePipeline(model=model)
-    completed_segments = []
-    status = 'Unknown'
-    audio = load_audio_from_mp3(mp3_path)
+def decode_opts() -> dict:
+    """The module-level decode settings, as iter_segments keyword args."""
+    return {'beam_size': BEAM_SIZE, 'patience': PATIENCE, 'vad': VAD,
+            'vad_min_silence_ms': VAD_MIN_SILENCE_MS, 'batch_size': BATCH_SIZE}
 
-    try:
-        # We set log_progress=True to see the progress bar in the console.
+def iter_segments(pipe: BatchedInferencePipeline, audio: np.ndarray,
+                  beam_size: int = BEAM_SIZE, patience: float = PATIENCE,
+                  vad: bool = VAD, vad_min_silence_ms: int = VAD_MIN_SILENCE_MS,
+                  batch_size: int = BATCH_SIZE):
+    """
+    Yields segment dicts as faster-whisper produces them. The decode
+    settings are parameters (not module globals) so a warm server can
+    honour whatever the *client's* settings are for each job.
+    """
+    # Mel/STFT feature extraction happens natively inside CTranslate2
+    # (threaded C++), so the raw PCM array is all we hand over here.
+    # We set log_progress=True to see the progress bar in the console.
+    if vad:
         segments, _ = pipe.transcribe(
             audio,
-            beam_size=3,        # greedy, 1 = fastest, 5 default
-            patience=1.2,       # 1.0 = default, 1.2 = more accurate
-            vad_filter=True,    # skip silence
+            beam_size=beam_size,
+            patience=patience,
+            vad_filter=True,    # skip silence (built-in silero VAD)
+            vad_parameters={'min_silence_duration_ms': vad_min_silence_ms},
+            log_progress=True,
+            multilingual=True,
+            batch_size=batch_size,  # decode x# segments in parallel
+        )
+    else:
+        # The batched pipeline needs VAD (or explicit clip timestamps) to
+        # form its windows and refuses vad_filter=False on clips ≥ 30 s,
+        # so run the sequential sliding-window model instead.
+        segments, _ = pipe.model.transcribe(
+            audio,
+            beam_size=beam_size,
+            patience=patience,
+            vad_filter=False,
             log_progress=True,
             multilingual=True,
-            batch_size=8,       # decode x# segments in parallel (my cpu has 8 cores)
         )
+    for segment in segments:
+        yield {
+            'text': segment.text,
+            'start': segment.start,
+            'end': segment.end
+        }
+
+
+# ───────── warm model server ───────── #
+
+_SERVER_AUTHKEY = b'input_2_txt'
+
+def server_address(model_name: str, compute_type: str):
+    """
+    Per-model+compute-type endpoint: named pipe on Windows, Unix socket
+    elsewhere. The compute type is baked into the loaded model, so a
+    server started under a different COMP_TYPE must not be reused.
+    """
+    if os.name == 'nt':
+        return rf'\\.\pipe\whisper_{model_name}_{compute_type}'
+    return f'/tmp/whisper_{model_name}_{compute_type}.sock'
 
+def serve(model_name: str, compute_type: str):
+    """
+    Long-lived worker: load the model once, then answer transcription
+    jobs from clients so later runs skip model load + CUDA context init.
+    Exits on its own after SERVER_IDLE_MIN minutes without a job.
+    """
+    pipe = load_pipeline(model_name, compute_type)
+
+    # Warm-up: decode one second of silence so kernel/memory-pool init is
+    # paid at server start, not on the first real job.
+    warm_segments, _ = pipe.transcribe(
+        np.zeros(16000, dtype=np.float32),
+        beam_size=1, vad_filter=False, batch_size=1)
+    for _ in warm_segments:
+        pass
+
+    address = server_address(model_name, compute_type)
+    if os.name != 'nt' and os.path.exists(address):
+        os.unlink(address)
+
+    last_job = [time.time()]
+
+    def idle_exit():
+        while True:
+            time.sleep(30)
+            if time.time() - last_job[0] > SERVER_IDLE_MIN * 60:
+                os._exit(0)
+    threading.Thread(target=idle_exit, daemon=True).start()
+
+    with Listener(address, authkey=_SERVER_AUTHKEY) as listener:
+        while True:
+            with listener.accept() as conn:
+                last_job[0] = time.time()
+                try:
+                    job = conn.recv()
+                    # Decode with the settings the client sent, not the
+                    # ones this server happened to start with.
+                    for seg in iter_segments(pipe, job['audio'], **job.get('opts', {})):
+                        conn.send(seg)
+                        last_job[0] = time.time()  # job in flight – keep the watchdog at bay
+                    conn.send(None)  # end-of-transcript sentinel
+                except (EOFError, OSError):
+                    pass  # client vanished mid-job – drop it
+                except Exception as e:
+                    # A bad job must not take the warm server down; the
+                    # closed connection tells the client the job failed.
+                    print(f'▶ Job failed: {e}', file=sys.stderr)
+                last_job[0] = time.time()
+
+def remote_segments(audio: np.ndarray, model_name: str, compute_type: str):
+    """
+    Generator of segment dicts from the warm background server, or None
+    if the server can't be reached (caller falls back to in-process).
+    """
+    address = server_address(model_name, compute_type)
+    try:
+        conn = Client(address, authkey=_SERVER_AUTHKEY)
+    except (OSError, ConnectionRefusedError):
+        conn = None
+        print('▶ Starting background Whisper server …')
+        if os.name == 'nt':
+            kwargs = {'creationflags': subprocess.DETACHED_PROCESS}
+        else:
+            kwargs = {'start_new_session': True}
+        proc = subprocess.Popen([sys.executable, __file__, '--server'], **kwargs)
+        # Wait as long as the spawned server is still alive and starting
+        # up: a cold model load (or first-run model download) can take
+        # minutes, and falling back early would load a second copy of the
+        # model in-process right next to it.
+        while proc.poll() is None:
+            time.sleep(1)
+            try:
+                conn = Client(address, authkey=_SERVER_AUTHKEY)
+                break
+            except (OSError, ConnectionRefusedError):
+                pass
+    if conn is None:
+        print('▶ Whisper server failed to start – transcribing in-process.')
+        return None
+
+    def gen():
+        with conn:
+            conn.send({'audio': audio, 'opts': decode_opts()})
+            while True:
+                try:
+                    seg = conn.recv()
+                except (EOFError, OSError) as e:
+                    raise RuntimeError(
+                        'Whisper server dropped the connection mid-job – '
+                        'the job failed server-side or the server died. '
+                        'Re-run (a fresh server will be spawned), or set '
+                        'USE_SERVER = False to transcribe in-process.'
+                    ) from e
+                if seg is None:
+                    break
+                yield seg
+    return gen()
+
+
+def transcribe(audio: np.ndarray,
+               txt_path: pathlib.Path,
+               model_name: str,
+               compute_type: str,
+               source: str,
+               start: str,
+               end: str,
+               pipe_fut=None):
+    """Transcribes the audio using faster-whisper and handles interrupts gracefully."""
+    print('\n[2/2] Transcribing audio …')
+    t0 = time.time()
+
+    seg_iter = remote_segments(audio, model_name, compute_type) if USE_SERVER else None
+    if seg_iter is None:
+        # Use the pipeline preloaded during the audio fetch if main()
+        # started one; otherwise load here.
+        pipe = pipe_fut.result() if pipe_fut is not None else load_pipeline(model_name, compute_type)
+        seg_iter = iter_segments(pipe, audio)
+
+    status = 'Unknown'
+    wrote_any = False
+
+    try:
         print("▶ Press Ctrl+C to interrupt and save partial progress.")
-        
-        # The magic happens here: we process the generator and store results as they come.
-        for segment in segments:
-            # Print to screen in real-time
-            print(f"\n[{sec_to_ts(int(segment.start))} --> {sec_to_ts(int(segment.end))}] {segment.text}")
-
-            # Store the structured data
-            completed_segments.append({
-                'text': segment.text,
-                'start': segment.start,
-                'end': segment.end
-            })
-
-        print('\n▶ Transcription complete – writing file…')
-        write_transcript(completed_segments, txt_path, source, start, end)
+
+        # Stream straight to disk: line-buffered, so the file can be
+        # tailed while Whisper runs and an interrupt loses nothing.
+        # (You could also format this as an SRT file, JSON, etc.)
+        with txt_path.open('w', encoding='utf-8', buffering=1) as fout:
+            fout.write(f'Transcript of: "{source}"\n')
+            fout.write(f"Full duration: [{start} --> {end}]\n\n")
+            for segment in seg_iter:
+                line = (f"[{sec_to_ts(int(segment['start']))} --> "
+                        f"{sec_to_ts(int(segment['end']))}] {segment['text'].strip()}")
+                # Print to screen in real-time
+                print('\n' + line, flush=True)
+                fout.write(line + '\n')
+                wrote_any = True
+
+        print('\n▶ Transcription complete.')
         status = 'Completed'
 
     except KeyboardInterrupt:
-        print('\n▶ Keyboard interrupt – saving partial transcript…')
-        # If interrupted, write whatever we have collected so far.
-        if completed_segments:
-            write_transcript(completed_segments, txt_path, source, start, end)
+        # Everything produced so far is already on disk.
+        print('\n▶ Keyboard interrupt – partial transcript is on disk.')
+        if wrote_any:
             status = 'Interrupted (Partial)'
         else:
             print("  No segments were transcribed before interruption.")
@@ -251,6 +549,23 @@ def transcribe(mp3_path: pathlib.Path,
 def main():
     print('--- SCRIPT START ---')
     try:
+        src_path = pathlib.Path(SOURCE).expanduser()
+        is_local = src_path.is_file()
+
+        # — probe the duration in the background; for URLs this is a full
+        #   yt-dlp extractor round-trip that overlaps with the setup below —
+        executor = ThreadPoolExecutor(max_workers=2)
+        if is_local:
+            dur_fut = executor.submit(get_local_duration, src_path)
+        else:
+            dur_fut = executor.submit(probe_url, SOURCE)
+
+        # Preload the model while the audio is fetched. With USE_SERVER the
+        # warm server already holds it, so only for in-process transcription.
+        pipe_fut = None
+        if not USE_SERVER:
+            pipe_fut = executor.submit(load_pipeline, MODEL, COMP_TYPE)
+
         out_root = ensure_outdir(OUTDIR)
         run_dir  = out_root / f"run_{datetime.now():%Y%m%d_%H%M%S}"
         run_dir.mkdir()
@@ -259,14 +574,13 @@ def main():
         mp3_path = run_dir / 'audio.mp3'
         txt_path = run_dir / 'transcript.txt'
 
-        src_path = pathlib.Path(SOURCE).expanduser()
-        is_local = src_path.is_file()
-
-        # — determine duration & clip range —
+        # — determine clip range (blocks on the probe only now) —
         if is_local:
-            dur = get_local_duration(src_path)
+            dur = dur_fut.result()
+            media_url, headers = None, {}
         else:
-            dur = get_video_duration(SOURCE)
+            dur, media_url, headers = dur_fut.result()
+        executor.shutdown(wait=False)  # pipe_fut (if any) keeps loading
 
         if dur:
             s_sec = ts_to_sec(START_TS) if START_TS else 0
@@ -285,13 +599,20 @@ def main():
 
         # — fetch or extract audio —
         if is_local:
-            extract_audio_local(src_path.resolve(), start, end, mp3_path)
+            audio = extract_audio_local(src_path.resolve(), start, end, mp3_path)
         else:
-            download_audio(SOURCE, start, end, mp3_path)
+            audio = download_audio(SOURCE, start, end, mp3_path, media_url, headers)
 
-        # — Whisper transcription —
+        # — Whisper transcription (skipped for clips we already know) —
 
-        transcribe(mp3_path, txt_path, MODEL, COMP_TYPE, SOURCE, start, end)
+        cache_file = cache_file_for(audio, MODEL) if USE_CACHE else None
+        if cache_file is not None and cache_file.exists():
+            shutil.copy(cache_file, txt_path)
+            print(f'\n✔ Identical clip transcribed before – cached transcript copied to {txt_path}')
+        else:
+            transcribe(audio, txt_path, MODEL, COMP_TYPE, SOURCE, start, end, pipe_fut)
+            if cache_file is not None:
+                cache_store(txt_path, cache_file)
         print('\n--- SCRIPT FINISHED SUCCESSFULLY ---')
 
     except KeyboardInterrupt:
@@ -304,5 +625,8 @@ def main():
 
 
 if __name__ == '__main__':
-    for SOURCE in SOURCES:
-        main()
+    if '--server' in sys.argv[1:]:
+        serve(MODEL, COMP_TYPE)
+    else:
+        for SOURCE in SOURCES:
+            main()